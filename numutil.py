@@ -14,15 +14,21 @@ For example,
     >>> num2str(1234567, style='words')
     'one million, two hundred thirty four thousand, five hundred sixty seven'
 
-It exposes two functions to the user: str2num and num2str, which do what you 
-would think.
+Its two main functions are str2num and num2str, which do what you would
+think. For bulk work, str2num_column parses a column of strings written in
+one consistent format quickly, num2str_range renders whole ranges of numbers
+quickly, num2str_column formats a table column in newspaper style with one
+shared scale word, and num2str_words spells out whole lists of numbers.
 """
 
-__all__ = ["str2num", "num2str"]
+__all__ = ["str2num", "str2num_column", "num2str", "num2str_range",
+        "num2str_column", "num2str_words"]
 
 import re
-from math import log10, floor
-from fractions import Fraction
+import operator
+from math import log10, floor, isinf, isnan
+from numbers import Rational
+from fractions import Fraction, gcd
 
 
 _str2num = dict([('zero', 0), ('one', 1), ('two', 2), ('three', 3),
@@ -69,10 +75,231 @@ _unit_words = {'dozen': 12, 'gross': 144, 'score': 20, 'scores': 20}
 # Strings that aren't numbers
 _special_nonnum_strs = set(['and', 'a', '', '-'])
 
-def str2num(numstr):
+def _rational_operators(monomorphic, fallback):
+    """Makes the forward and reverse methods of an arithmetic operator for
+    _Rational, in the same way as fractions.Fraction does. monomorphic
+    takes two _Rationals, and fallback is the operator for other types. Mixed
+    with a Fraction, the result is a Fraction. For internal use only."""
+
+    def forward(a, b):
+        if isinstance(b, (int, long)):
+            return monomorphic(a, _Rational(b))
+        elif isinstance(b, _Rational):
+            return monomorphic(a, b)
+        elif isinstance(b, float):
+            return fallback(float(a), b)
+        return NotImplemented  # Fraction's reverse method handles Fractions
+
+    def reverse(b, a):
+        if isinstance(a, (int, long)):
+            return monomorphic(_Rational(a), b)
+        elif isinstance(a, float):
+            return fallback(a, float(b))
+        elif isinstance(a, Rational):
+            return fallback(a, b.to_fraction())
+        return NotImplemented
+
+    return forward, reverse
+
+class _Rational(object):
+    """A lightweight rational number, much cheaper to make than a Fraction.
+    Like a Fraction, it is always in lowest terms, with a positive
+    denominator, and it works with ints, floats and Fractions in
+    arithmetic and comparisons. str2num uses it internally, and returns it
+    when called with fast_fractions=True.
+
+    >>> from numutil import _Rational
+    >>> from fractions import Fraction
+    >>> x = 1 + _Rational(1, 2) + _Rational(1, 6)
+    >>> x
+    _Rational(5, 3)
+    >>> x * 3, -x / 2, x - 1 < 1
+    (_Rational(5, 1), _Rational(-5, 6), True)
+    >>> x + Fraction(1, 3)
+    Fraction(2, 1)
+    >>> x.to_fraction()
+    Fraction(5, 3)
+
+    """
+
+    __slots__ = ('numerator', 'denominator')
+
+    def __init__(self, numerator, denominator=1):
+        if denominator == 0:
+            raise ZeroDivisionError('_Rational(%s, 0)' % numerator)
+        g = gcd(numerator, denominator)  # Has the sign of denominator
+        self.numerator = numerator // g
+        self.denominator = denominator // g
+
+    def to_fraction(self):
+        # Fraction trusts other Rationals to be in lowest terms, so this
+        # doesn't need a second gcd
+        return Fraction(self)
+
+    def __repr__(self):
+        return '_Rational(%d, %d)' % (self.numerator, self.denominator)
+
+    def __str__(self):
+        if self.denominator == 1:
+            return str(self.numerator)
+        return '%d/%d' % (self.numerator, self.denominator)
+
+    def _add(a, b):
+        return _Rational(a.numerator * b.denominator +
+                b.numerator * a.denominator, a.denominator * b.denominator)
+
+    def _sub(a, b):
+        return _Rational(a.numerator * b.denominator -
+                b.numerator * a.denominator, a.denominator * b.denominator)
+
+    def _mul(a, b):
+        return _Rational(a.numerator * b.numerator,
+                a.denominator * b.denominator)
+
+    def _div(a, b):
+        return _Rational(a.numerator * b.denominator,
+                a.denominator * b.numerator)
+
+    __add__, __radd__ = _rational_operators(_add, operator.add)
+    __sub__, __rsub__ = _rational_operators(_sub, operator.sub)
+    __mul__, __rmul__ = _rational_operators(_mul, operator.mul)
+    __truediv__, __rtruediv__ = _rational_operators(_div, operator.truediv)
+    __div__, __rdiv__ = __truediv__, __rtruediv__
+
+    def _floordiv(a, b):
+        return (a.numerator * b.denominator) // (a.denominator * b.numerator)
+
+    def _mod(a, b):
+        return _Rational((a.numerator * b.denominator) %
+                (b.numerator * a.denominator), a.denominator * b.denominator)
+
+    __floordiv__, __rfloordiv__ = _rational_operators(_floordiv,
+            operator.floordiv)
+    __mod__, __rmod__ = _rational_operators(_mod, operator.mod)
+
+    def __divmod__(self, other):
+        return (self // other, self % other)
+
+    def __rdivmod__(self, other):
+        return (other // self, other % self)
+
+    def __pow__(a, b):
+        if isinstance(b, _Rational) and b.denominator == 1:
+            b = b.numerator
+        if isinstance(b, (int, long)):
+            if b >= 0:
+                return _Rational(a.numerator ** b, a.denominator ** b)
+            return _Rational(a.denominator ** -b, a.numerator ** -b)
+        elif isinstance(b, (float, Rational)):
+            return float(a) ** float(b)
+        return NotImplemented
+
+    def __rpow__(b, a):
+        if b.denominator == 1 and b.numerator >= 0:
+            return a ** b.numerator
+        elif isinstance(a, (int, long)):
+            return _Rational(a) ** b
+        elif b.denominator == 1:
+            return a ** b.numerator
+        return a ** float(b)
+
+    def __neg__(self):
+        return _Rational(-self.numerator, self.denominator)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _Rational(abs(self.numerator), self.denominator)
+
+    def __int__(self):  # Truncates towards zero, like Fraction
+        if self.numerator < 0:
+            return -(-self.numerator // self.denominator)
+        return self.numerator // self.denominator
+
+    __trunc__ = __int__
+
+    def __float__(self):
+        return operator.truediv(self.numerator, self.denominator)
+
+    def __complex__(self):
+        return complex(float(self))
+
+    @property
+    def real(self):
+        return self
+
+    @property
+    def imag(self):
+        return 0
+
+    def conjugate(self):
+        return self
+
+    def __nonzero__(self):
+        return self.numerator != 0
+
+    __bool__ = __nonzero__
+
+    def _richcmp(self, other, op):
+        if isinstance(other, (int, long)):
+            return op(self.numerator, other * self.denominator)
+        elif isinstance(other, _Rational):
+            return op(self.numerator * other.denominator,
+                    other.numerator * self.denominator)
+        elif isinstance(other, float):
+            return op(float(self), other)
+        elif isinstance(other, Rational):
+            return op(self.to_fraction(), other)
+        return NotImplemented
+
+    def __eq__(self, other):
+        return self._richcmp(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._richcmp(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._richcmp(other, operator.lt)
+
+    def __le__(self, other):
+        return self._richcmp(other, operator.le)
+
+    def __gt__(self, other):
+        return self._richcmp(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._richcmp(other, operator.ge)
+
+    def __hash__(self):
+        return hash(self.to_fraction())
+
+Rational.register(_Rational)
+
+def _parse_slash(numstr, fast_fractions=False):
+    """Turns a fraction string like ' 6,343 /5 ' into a Fraction, or a
+    _Rational if fast_fractions, which is much faster than
+    Fraction(numstr). For internal use only."""
+    numstr = numstr.replace(',', '').replace(' ', '')
+    numerator, denominator = numstr.split('/')
+    numerator, denominator = int(numerator), int(denominator)
+    if denominator == 0:
+        raise ZeroDivisionError('Fraction(%s, 0)' % numerator)
+    if fast_fractions:
+        return _Rational(numerator, denominator)
+    return Fraction(numerator, denominator)
+
+def str2num(numstr, fast_fractions=False):
     """str2num takes a string representation of a number, and returns 
     the number. If it doesn't find a number, it will raise a ValueError.
 
+    Arguments:
+    fast_fractions: if True, fractions are returned as lightweight
+                    rationals instead of as Fractions. They support the
+                    usual arithmetic and comparisons, mix with ints, floats
+                    and Fractions, and are accepted by num2str and by
+                    Fraction(x). Default is False
+
     Example:
     >>> from numutil import str2num
     >>> str2num('4.5 million')
@@ -93,7 +320,7 @@ def str2num(numstr):
 
     m = re.match(r'[ ]*[-]?[0-9,]+[ ]*/[ ]*[0-9,]+[ ]*', numstr)
     if m:
-        return Fraction(re.sub(r'[, ]*', '', numstr))
+        return _parse_slash(numstr, fast_fractions)
 
     # Try to parse numstr as a word-mix
     numstr = numstr.lower()
@@ -138,13 +365,13 @@ def str2num(numstr):
                     denom = _str2denom[word]
                     if andcount:  # like 'three and a half'
                         if int(magnitude) == magnitude:
-                            result += Fraction(int(magnitude), denom)
+                            result += _Rational(int(magnitude), denom)
                         else:
                             result += float(magnitude) / float(denom)
                     else:  # like 'three halves'
                         result += magnitude
                         if int(result) == result:
-                            result = Fraction(int(result), denom)
+                            result = _Rational(int(result), denom)
                         else:
                             result = float(result) / float(denom)
                     magnitude = 0
@@ -153,11 +380,123 @@ def str2num(numstr):
                             " did not recognize the word '%s'" % (numstr, word))
 
     result += magnitude
-    if int(result) == result and not isinstance(result, Fraction):
+    if isinstance(result, _Rational):
+        return result if fast_fractions else result.to_fraction()
+    elif int(result) == result:
         return int(result)
     else:
         return result
 
+# Specialized parsers for str2num_column. Each one either returns exactly
+# what str2num would return, or raises a ValueError so the cell falls back
+# to str2num.
+_fraction_re = re.compile(r'[ ]*-?[0-9,]+[ ]*/[ ]*[0-9,]+[ ]*\Z')
+_suffix_re = re.compile(r'[ ]*([0-9,]*\.?[0-9]+)[ ]+(%s)[ ]*\Z' % '|'.join(
+    word for word, num in _str2num.items() if num >= 1000))
+
+def _parse_commas_int(numstr):
+    return int(numstr.replace(',', ''))
+
+def _parse_float(numstr):
+    if '.' not in numstr:  # str2num would return an int
+        raise ValueError
+    return float(numstr)
+
+def _parse_commas_float(numstr):
+    if '.' not in numstr:
+        raise ValueError
+    return float(numstr.replace(',', ''))
+
+def _parse_fraction(numstr):
+    if _fraction_re.match(numstr) is None:
+        raise ValueError
+    return _parse_slash(numstr)
+
+def _parse_suffixed(numstr):
+    m = _suffix_re.match(numstr.lower())
+    if m is None:
+        raise ValueError
+    word = m.group(1).replace(',', '')
+    try: num = int(word)
+    except ValueError: num = float(word)
+    result = num * _str2num[m.group(2)]
+    return int(result) if int(result) == result else result
+
+# (format name, regex recognizing a cell of that format, parser). The
+# comma-grouped formats also accept ungrouped cells, and on ties
+# _infer_column_format prefers the format listed first
+_column_formats = [
+    ('int', re.compile(r'[ ]*-?[0-9]+[ ]*\Z'), int),
+    ('commas_int', re.compile(r'[ ]*-?([0-9]{1,3}(,[0-9]{3})*|[0-9]+)[ ]*\Z'),
+        _parse_commas_int),
+    ('float', re.compile(r'[ ]*-?[0-9]*\.[0-9]+([eE][-+]?[0-9]+)?[ ]*\Z'),
+        _parse_float),
+    ('commas_float',
+        re.compile(r'[ ]*-?([0-9]{1,3}(,[0-9]{3})*|[0-9]+)\.[0-9]+[ ]*\Z'),
+        _parse_commas_float),
+    ('fraction', _fraction_re, _parse_fraction),
+    ('suffixed', _suffix_re, _parse_suffixed)]
+_column_parsers = dict((name, parser) for name, _, parser in _column_formats)
+
+def _infer_column_format(sample):
+    """Returns the name of the format that accepts the most strings in
+    sample, or None if no format accepts most of them. For internal use
+    only.
+
+    >>> from numutil import _infer_column_format
+    >>> _infer_column_format(['1,234', '56', '7,890,123'])
+    'commas_int'
+    >>> _infer_column_format(['12.50', '1,234.56', '99.99'])
+    'commas_float'
+    >>> _infer_column_format(['3.2 million', '12 billion'])
+    'suffixed'
+    >>> _infer_column_format(['one', 'two', '3'])
+
+    """
+    counts = dict((name, 0) for name, _, _ in _column_formats)
+    for numstr in sample:
+        lowered = numstr.lower()
+        for name, regex, _ in _column_formats:
+            if regex.match(lowered):
+                counts[name] += 1
+
+    best = None
+    for name, _, _ in _column_formats:
+        if best is None or counts[name] > counts[best]:
+            best = name
+    return best if 2 * counts[best] > len(sample) else None
+
+def str2num_column(numstrs, sample_size=100):
+    """Parses a whole column of strings into numbers. The result is the
+    same as [str2num(numstr) for numstr in numstrs], but much faster for
+    columns written in one consistent format.
+
+    The format of the column, (like '1,234.56', '3/4' or '3.2 million'), is
+    inferred from its first sample_size strings, and each string is parsed
+    with a parser specialized to that format. Strings that the specialized
+    parser doesn't accept are passed on to str2num.
+
+    Example:
+    >>> from numutil import str2num_column
+    >>> str2num_column(['1,234.5', '6.75', '12'])
+    [1234.5, 6.75, 12]
+    >>> str2num_column(['1/2', '3/4', 'a half'])
+    [Fraction(1, 2), Fraction(3, 4), Fraction(1, 2)]
+
+    """
+    numstrs = list(numstrs)
+    name = _infer_column_format(numstrs[:sample_size])
+    if name is None:
+        return [str2num(numstr) for numstr in numstrs]
+
+    parser = _column_parsers[name]
+    results = []
+    append = results.append
+    for numstr in numstrs:
+        try: append(parser(numstr))
+        except ValueError: append(str2num(numstr))
+    return results
+
 def _sigfig_round(num, sig_figs):
     """rounds num to a given number of significant digits, sig_figs.
     sig_figs must a positive integer, or else this throws a ValueError
@@ -196,7 +535,88 @@ def _small_wordify(num):
                 results.append(_num2str[num % 10])
         return " ".join(results)
 
-def num2str(num, style='commas', frac_style='mixed', sig_figs='default'):
+# Table of the words for every group 0 <= num < 1000, and for single digits
+_small_words = [_small_wordify(num) for num in range(1000)]
+_digit_words = dict((str(num), _num2str[num]) for num in range(10))
+_too_large_for_words = 1000 * max(_num2str)
+
+def _int_wordify(num):
+    """Turns num, an int or long >= 0, into words. For internal use only."""
+    if num < 1000:
+        return _small_words[num]
+    if num >= _too_large_for_words:
+        raise ValueError("%d is too large to turn into words" % num)
+    results = []
+    mod_by = 1
+    while num > 0:
+        num, r = divmod(num, 1000)
+        if r != 0:
+            results.append(_small_words[r] +
+                (' ' + _num2str[mod_by] if mod_by != 1 else ''))
+        mod_by *= 1000
+    return ", ".join(reversed(results))
+
+def _digits_wordify(digits, exponent, decimal_style):
+    """Turns the number int(digits) * 10 ** exponent into words, where
+    digits is a string of decimal digits. For internal use only.
+
+    >>> from numutil import _digits_wordify
+    >>> _digits_wordify('125', -2, 'point')
+    'one point two five'
+    >>> _digits_wordify('125', -2, 'fraction')
+    'one and twenty five hundredths'
+
+    """
+    if exponent >= 0:
+        return _int_wordify(int(digits) * 10 ** exponent)
+
+    k = -exponent
+    digits = digits.rjust(k + 1, '0')
+    whole, frac = int(digits[:-k]), digits[-k:]
+
+    # Only tenths, hundredths, and thousandths, millionths, etc. are single
+    # words. 'five hundred thousandths' is ambiguous, so round k up to one
+    # of those and pad the numerator, giving 'fifty millionths'
+    padded_k = k if k < 3 else -(-k // 3) * 3
+    if decimal_style == 'fraction' and 10 ** padded_k in _denom2str:
+        numerator = int(frac) * 10 ** (padded_k - k)
+        if numerator == 0:
+            return _int_wordify(whole)
+        result = _int_wordify(numerator) + ' ' + _denom2str[10 ** padded_k]
+        if numerator != 1:
+            result += 's'
+        if whole:
+            result = _int_wordify(whole) + ' and ' + result
+        return result
+    else:  # 'point' style, or denominators too small to have a name
+        return _int_wordify(whole) + ' point ' + \
+                ' '.join([_digit_words[digit] for digit in frac])
+
+def _real_wordify(num, decimal_style):
+    """Turns num, a nonnegative int, long, float, or Decimal, into words.
+    For internal use only."""
+    if isinstance(num, (int, long)):
+        return _int_wordify(num)
+    elif isinstance(num, float):
+        if isinf(num) or isnan(num):
+            raise ValueError("Can't turn %s into words" % num)
+        # repr gives the shortest digits that round-trip
+        mantissa, _, exp = repr(num).partition('e')
+        intpart, _, fracpart = mantissa.partition('.')
+        fracpart = fracpart.rstrip('0')
+        return _digits_wordify(intpart.lstrip('-') + fracpart,
+                int(exp or 0) - len(fracpart), decimal_style)
+    elif hasattr(num, 'as_tuple'):  # Decimals, by ducktyping
+        _, digits, exponent = num.as_tuple()
+        if not isinstance(exponent, (int, long)):
+            raise ValueError("Can't turn %s into words" % num)
+        return _digits_wordify(''.join(map(str, digits)), exponent,
+                decimal_style)
+    else:
+        raise TypeError("Don't know how to turn %s into words" % type(num))
+
+def num2str(num, style='commas', frac_style='mixed', sig_figs='default',
+        decimal_style='point'):
     """Turns the number num into a pretty string.
 
     Arguments:
@@ -260,6 +680,27 @@ def num2str(num, style='commas', frac_style='mixed', sig_figs='default'):
                 >>> num2str(12.345, sig_figs=1)
                 '10'
 
+
+    decimal_style:  how the words style says the decimal part of floats and
+                Decimals.
+                if 'point', it will say each digit, like 'one point two five'
+                if 'fraction', it will say it as a fraction, like 'one and
+                    twenty five hundredths'
+                Default is 'point'
+
+                Examples:
+
+                >>> from numutil import num2str
+                >>> from decimal import Decimal
+                >>> num2str(1.25, style='words')
+                'one point two five'
+                >>> num2str(Decimal('3.07'), style='words')
+                'three point zero seven'
+                >>> num2str(1.25, style='words', decimal_style='fraction')
+                'one and twenty five hundredths'
+                >>> num2str(0.004, style='words', decimal_style='fraction')
+                'four thousandths'
+
     """
 
     # Test the arguments for misspellings
@@ -274,7 +715,10 @@ def num2str(num, style='commas', frac_style='mixed', sig_figs='default'):
     except AttributeError:
         pass
 
-    if numerator is not None and denominator != 1:
+    if numerator is not None and denominator == 1:
+        num = numerator  # Handle whole Fractions and _Rationals as ints
+
+    elif numerator is not None:
 
         # negative numerators mess with the divmod trick
         if numerator < 0:
@@ -393,24 +837,218 @@ def num2str(num, style='commas', frac_style='mixed', sig_figs='default'):
             return num2str(num, 'commas', frac_style, sig_figs)
             
     elif style == 'words':
+        if decimal_style not in ('point', 'fraction'):
+            raise ValueError("Unrecognized decimal_style: '%s'"
+                    % decimal_style)
         if num < 0:
-            return "negative " + num2str(-num, style, frac_style, sig_figs)
-        if isinstance(num, float):
-            raise NotImplementedError
-        elif isinstance(num, (int, long)):
-            if num == 0:
-                return "zero"
-            results = []
-            mod_by = 1
-            while num > 0:
-                num, r = divmod(num, 1000)
-                if r != 0:
-                    results.append(_small_wordify(r) +
-                        (' ' + _num2str[mod_by] if mod_by != 1 else ''))
-                mod_by *= 1000
-            return ", ".join(reversed(results))
-        else:
-            raise TypeError("Don't know how to turn %s into words" % type(num))
+            return "negative " + _real_wordify(-num, decimal_style)
+        return _real_wordify(num, decimal_style)
 
     else:
         raise ValueError("Unrecognized style: '%s'" % style)
+
+def num2str_range(start, stop=None, step=1, style='words'):
+    """Generates num2str(i, style) for each i in range(start, stop, step),
+    but faster, since consecutive numbers share all of their higher
+    1000-groups. Only the lowest group is recomputed for each number; the
+    string for the higher groups is cached and reused until it changes.
+
+    Like xrange, num2str_range(stop) counts up from zero, but unlike
+    xrange, start and stop may be arbitrarily large longs.
+
+    Arguments:
+    style:      one of 'words', 'commas' or 'nocommas', as in num2str.
+                Default is 'words'
+
+    Examples:
+
+    >>> from numutil import num2str_range
+    >>> list(num2str_range(998, 1002))
+    ['nine hundred ninety eight', 'nine hundred ninety nine', 'one thousand', 'one thousand, one']
+    >>> list(num2str_range(999998, 1000004, 2, style='commas'))
+    ['999,998', '1,000,000', '1,000,002']
+
+    """
+    if stop is None:
+        start, stop = 0, start
+    if step == 0:
+        raise ValueError("num2str_range() step argument must not be zero")
+    for arg in (start, stop, step):
+        if not isinstance(arg, (int, long)):
+            raise TypeError("num2str_range() only accepts integers, not %s"
+                    % type(arg))
+    if style not in ('words', 'commas', 'nocommas'):
+        raise ValueError("Unrecognized style: '%s'" % style)
+
+    # Validate eagerly, like xrange, and only then hand back the generator
+    return _num2str_range(start, stop, step, style)
+
+def _num2str_range(start, stop, step, style):
+    """The generator behind num2str_range, which validates the arguments.
+    For internal use only."""
+    cached_high, prefix = None, None
+    num = start
+    while (num < stop) if step > 0 else (num > stop):
+        if style == 'nocommas':
+            yield str(num)
+            num += step
+            continue
+
+        high, low = divmod(abs(num), 1000)
+        if high != cached_high:
+            cached_high = high
+            if high == 0:
+                prefix = None
+            elif style == 'words':
+                prefix = num2str(high * 1000, 'words')
+            else:
+                prefix = num2str(high, 'commas')
+
+        if style == 'words':
+            if prefix is None:
+                result = _small_wordify(low)
+            elif low == 0:
+                result = prefix
+            else:
+                result = prefix + ", " + _small_wordify(low)
+            if num < 0:
+                result = "negative " + result
+        else:
+            if prefix is None:
+                result = "%d" % low
+            else:
+                result = "%s,%03d" % (prefix, low)
+            if num < 0:
+                result = "-" + result
+
+        yield result
+        num += step
+
+def _fixed_point(num, sig_figs):
+    """Formats num, a float >= 0, in fixed-point notation with commas,
+    showing sig_figs significant digits, or all of the digits of its repr
+    if sig_figs is None. Never uses scientific notation. For internal use
+    only.
+
+    >>> from numutil import _fixed_point
+    >>> _fixed_point(0.98, 3), _fixed_point(1.2e-05, 3), _fixed_point(3500.0, 3)
+    ('0.980', '0.0000120', '3,500')
+    >>> _fixed_point(1.2e-05, None), _fixed_point(25.0, None)
+    ('0.000012', '25')
+
+    """
+    if sig_figs is None:
+        mantissa, _, exp = repr(num).partition('e')
+        fracpart = mantissa.partition('.')[2].rstrip('0')
+        decimals = max(0, len(fracpart) - int(exp or 0))
+    elif num == 0:
+        decimals = sig_figs - 1
+    else:
+        num = _sigfig_round(num, sig_figs)
+        decimals = max(0, sig_figs - 1 - int(floor(log10(num))))
+
+    intpart, dot, fracpart = ('%.*f' % (decimals, num)).partition('.')
+    return num2str(int(intpart), 'commas') + dot + fracpart
+
+def num2str_column(nums, scale='max', sig_figs=3):
+    """Formats a whole column of numbers in newspaper style, with one scale
+    word shared by every value, the way tables say "(in millions)". Returns
+    a pair (strings, scale_word), where scale_word is None if the column
+    was not scaled at all.
+
+    The scale is chosen once for the column, so no per-value logs are
+    needed beyond the rounding to sig_figs.
+
+    Arguments:
+    scale:      if 'max', picks the newspaper scale of the largest value
+                if 'median', picks the newspaper scale of the median value
+                if a scale word like 'million', or its value like 10 ** 6,
+                    uses that scale. 'thousand' is allowed here, since
+                    tables often use it, even though newspapers do not.
+                As in num2str, 'max' and 'median' leave columns below a
+                million unscaled. Default is 'max'
+    sig_figs:   as in num2str. Default is 3
+
+    Examples:
+
+    >>> from numutil import num2str_column
+    >>> num2str_column([1234567, 25000000, 980000])
+    (['1.23', '25.0', '0.980'], 'million')
+    >>> num2str_column([1234567, 25000000, 980000], scale='thousand')
+    (['1,230', '25,000', '980'], 'thousand')
+    >>> num2str_column([1234, 56])
+    (['1,230', '56'], None)
+
+    """
+    nums = list(nums)
+    for num in nums:
+        if num != num or abs(num) == float('inf'):
+            raise ValueError("Can't format %s in a newspaper column" % num)
+
+    if scale in ('max', 'median'):
+        mags = sorted(abs(num) for num in nums if num != 0)
+        if not mags:
+            divisor = 1
+        else:
+            if scale == 'max':
+                ref = mags[-1]
+            else:
+                ref = mags[len(mags) // 2]
+            if sig_figs is not None:  # Round first, as num2str does
+                ref = _sigfig_round(ref, sig_figs)
+            d = int(log10(ref) / 3) * 3
+            divisor = 10 ** d if 10 ** d in _num2str and d > 3 else 1
+    elif scale in _str2num and scale != 'a':
+        divisor = _str2num[scale]
+    else:
+        divisor = scale
+
+    if divisor != 1 and (divisor not in _num2str or divisor < 1000 or
+            divisor == 100):
+        raise ValueError("Unrecognized scale: '%s'" % scale)
+
+    if divisor == 1:
+        return [num2str(num, 'commas', sig_figs=sig_figs)
+                for num in nums], None
+
+    results = []
+    fdivisor = float(divisor)
+    for num in nums:
+        result = _fixed_point(float(abs(num)) / fdivisor, sig_figs)
+        results.append('-' + result if num < 0 else result)
+    return results, _num2str[divisor]
+
+def num2str_words(nums, decimal_style='point', sig_figs=None):
+    """Spells out every number in nums in words. The result is the same as
+    [num2str(num, 'words', sig_figs=sig_figs, decimal_style=decimal_style)
+    for num in nums], but ints, floats and Decimals skip num2str's
+    per-value argument handling, which makes long lists much faster.
+
+    Example:
+    >>> from numutil import num2str_words
+    >>> num2str_words([3, -0.5, 1234.25])
+    ['three', 'negative zero point five', 'one thousand, two hundred thirty four point two five']
+    >>> num2str_words([2.5, 0.75], decimal_style='fraction')
+    ['two and five tenths', 'seventy five hundredths']
+
+    """
+    if decimal_style not in ('point', 'fraction'):
+        raise ValueError("Unrecognized decimal_style: '%s'" % decimal_style)
+
+    results = []
+    append = results.append
+    for num in nums:
+        if not isinstance(num, (int, long, float)) and \
+                not hasattr(num, 'as_tuple'):  # Fractions and such
+            append(num2str(num, 'words', sig_figs=sig_figs,
+                decimal_style=decimal_style))
+            continue
+        if sig_figs is not None:
+            num = _sigfig_round(num, sig_figs)
+            if num == int(num):
+                num = int(num)
+        if num < 0:
+            append("negative " + _real_wordify(-num, decimal_style))
+        else:
+            append(_real_wordify(num, decimal_style))
+    return results
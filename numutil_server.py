@@ -0,0 +1,345 @@
+"""
+numutil_server runs numutil as a small local conversion server, so that
+programs written in other languages can use str2num and num2str without
+shelling out. It listens on a Unix socket or a localhost TCP port.
+
+Each request is one line. A plain line is parsed with str2num, and the
+answer is written back as a plain line, (or 'error: ...' if it couldn't be
+parsed). A line starting with '{' is a JSON request, answered with a JSON
+line:
+
+    {"op": "str2num", "value": "three and a half", "id": 1}
+    {"id": 1, "result": "7/2"}
+
+    {"op": "num2str", "value": 1234567, "kwargs": {"style": "words"}}
+    {"result": "one million, two hundred thirty four thousand, ..."}
+
+    {"op": "stats"}
+    {"result": {"requests": 2, "batches": 2, ...}}
+
+Fractions are returned as strings like "7/2", and NaN and infinities as
+"NaN", "Infinity" and "-Infinity", since JSON can't represent them.
+Requests arriving at about the same time from different connections are
+coalesced into micro-batches, and str2num batches are parsed with
+str2num_column. When too many requests are pending, connections block until
+the batches catch up.
+
+To run the server from the command line:
+
+    $ python numutil_server.py --port 8642
+    $ python numutil_server.py --unix /tmp/numutil.sock
+
+"""
+
+__all__ = ["Batcher", "make_server", "serve"]
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+import SocketServer
+from math import isinf, isnan
+from fractions import Fraction
+
+from numutil import str2num, str2num_column, num2str
+
+_num2str_kwargs = set(['style', 'frac_style', 'sig_figs', 'decimal_style'])
+
+
+class _Request(object):
+    """A single pending conversion. For internal use only."""
+
+    __slots__ = ['op', 'value', 'kwargs', 'start', 'done', 'result', 'error']
+
+    def __init__(self, op, value, kwargs):
+        self.op = op
+        self.value = value
+        self.kwargs = kwargs
+        self.start = time.time()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Batcher(object):
+    """Coalesces conversion requests from many threads into micro-batches,
+    which a single worker thread runs through numutil.
+
+    Arguments:
+    max_batch:      the largest number of requests handled in one batch.
+                    Default is 256
+    max_delay:      how long, in seconds, the worker waits for more
+                    requests before running a batch that isn't full.
+                    Default is 0.001
+    max_pending:    how many requests may wait for the worker before
+                    submit blocks. Default is 4096
+
+    Once close is called, submit raises a ValueError, and requests still
+    waiting for the worker fail with a ValueError instead of being run.
+
+    Example:
+    >>> from numutil_server import Batcher
+    >>> batcher = Batcher()
+    >>> batcher.submit('str2num', 'three and a half')
+    Fraction(7, 2)
+    >>> batcher.submit('num2str', 1234567, {'style': 'newspaper'})
+    '1.23 million'
+    >>> batcher.close()
+
+    """
+
+    def __init__(self, max_batch=256, max_delay=0.001, max_pending=4096):
+        if max_batch <= 0:
+            raise ValueError("max_batch is %s, but must be strictly greater"
+                    " than zero." % str(max_batch))
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._closed = False
+        self._cond = threading.Condition()  # Guards _pending and _closed
+        self._lock = threading.Lock()  # Guards the statistics
+        self._started = time.time()
+        self._requests = 0
+        self._errors = 0
+        self._batches = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._worker = threading.Thread(target=self._run)
+        self._worker.daemon = True
+        self._worker.start()
+
+    def submit(self, op, value, kwargs=None):
+        """Converts value with the numutil function named op, either
+        'str2num' or 'num2str', and returns the result. Blocks while the
+        batcher is full. Errors from numutil are raised here, in the
+        submitting thread."""
+        if op not in ('str2num', 'num2str'):
+            raise ValueError("Unrecognized op: '%s'" % op)
+        kwargs = kwargs or {}
+        if op == 'str2num' and not isinstance(value, basestring):
+            raise TypeError("str2num needs a string, not %s" % type(value))
+        if op == 'str2num' and kwargs:
+            raise TypeError("str2num does not take any keyword arguments")
+        for key in kwargs:
+            if key not in _num2str_kwargs:
+                raise TypeError("num2str got an unexpected keyword argument"
+                        " '%s'" % key)
+
+        request = _Request(op, value, kwargs)
+        with self._cond:
+            while not self._closed and \
+                    len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            if self._closed:
+                raise ValueError("Batcher is closed")
+            self._pending.append(request)
+            self._cond.notify_all()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self):
+        """Returns a dict of throughput and latency statistics."""
+        with self._lock:
+            elapsed = time.time() - self._started
+            return {'requests': self._requests,
+                    'errors': self._errors,
+                    'batches': self._batches,
+                    'mean_batch_size': (float(self._requests) / self._batches
+                        if self._batches else 0.0),
+                    'mean_latency': (self._total_latency / self._requests
+                        if self._requests else 0.0),
+                    'max_latency': self._max_latency,
+                    'throughput': self._requests / elapsed if elapsed else 0.0,
+                    'pending': len(self._pending)}
+
+    def close(self):
+        """Stops the worker thread once its current batch is done, and fails
+        the requests still waiting for it."""
+        with self._cond:
+            self._closed = True
+            stranded = list(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        for request in stranded:
+            request.error = ValueError("Batcher was closed before the"
+                    " request could run")
+            request.done.set()
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                batch = [self._pending.popleft()]
+                deadline = time.time() + self.max_delay
+                while len(batch) < self.max_batch:
+                    if self._pending:
+                        batch.append(self._pending.popleft())
+                        continue
+                    timeout = deadline - time.time()
+                    if timeout <= 0 or self._closed:
+                        break
+                    self._cond.wait(timeout)
+                self._cond.notify_all()  # Wake submitters waiting for room
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        parses = [request for request in batch if request.op == 'str2num']
+        try:
+            results = str2num_column([request.value for request in parses])
+        except Exception:
+            # Some string in the batch is bad, so go one at a time
+            parses, results = [], []
+        for request, result in zip(parses, results):
+            request.result = result
+        parsed = set(id(request) for request in parses)
+
+        for request in batch:
+            if id(request) in parsed:
+                continue
+            try:
+                if request.op == 'str2num':
+                    request.result = str2num(request.value)
+                else:
+                    request.result = num2str(request.value, **request.kwargs)
+            except Exception as e:
+                request.error = e
+
+        now = time.time()
+        with self._lock:
+            self._batches += 1
+            for request in batch:
+                latency = now - request.start
+                self._requests += 1
+                self._errors += request.error is not None
+                self._total_latency += latency
+                self._max_latency = max(self._max_latency, latency)
+        for request in batch:
+            request.done.set()
+
+
+def _jsonable(num):
+    """Fractions, NaN and infinities aren't JSON, so send them as strings
+    like '7/2', 'NaN' and '-Infinity'. For internal use only."""
+    if isinstance(num, Fraction):
+        return "%d/%d" % (num.numerator, num.denominator)
+    elif isinstance(num, float) and (isinf(num) or isnan(num)):
+        return 'NaN' if isnan(num) else ('Infinity' if num > 0
+                else '-Infinity')
+    return num
+
+
+class _Handler(SocketServer.StreamRequestHandler):
+    """Answers the requests on one connection, one line at a time. For
+    internal use only."""
+
+    def handle(self):
+        batcher = self.server.batcher
+        for line in iter(self.rfile.readline, ''):
+            line = line.rstrip('\r\n')
+            if line.lstrip().startswith('{'):
+                self.wfile.write(json.dumps(self._handle_json(line)) + '\n')
+            else:
+                try:
+                    result = _jsonable(batcher.submit('str2num', line))
+                    response = repr(result) if isinstance(result, float) \
+                            else str(result)
+                except Exception as e:
+                    response = 'error: %s' % e
+                self.wfile.write(response + '\n')
+            self.wfile.flush()
+
+    def _handle_json(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("JSON requests must be objects")
+        except ValueError as e:
+            return {'error': 'bad request: %s' % e}
+
+        response = {}
+        if 'id' in request:
+            response['id'] = request['id']
+        try:
+            op = request.get('op', 'str2num')
+            if op == 'stats':
+                response['result'] = self.server.batcher.stats()
+            else:
+                kwargs = dict((str(key), value) for key, value
+                        in request.get('kwargs', {}).items())
+                response['result'] = _jsonable(self.server.batcher.submit(
+                        op, request.get('value'), kwargs))
+        except Exception as e:
+            response['error'] = str(e)
+        return response
+
+
+class _TCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def make_server(address, **batcher_kwargs):
+    """Returns a server listening on address, which is either a (host, port)
+    pair for TCP, or a path for a Unix socket. Call its serve_forever
+    method to start answering requests, and its shutdown and server_close
+    methods to stop. Extra keyword arguments are passed on to Batcher, which
+    is available as the server's batcher attribute."""
+    if isinstance(address, basestring):
+        server = _UnixServer(address, _Handler)
+    else:
+        server = _TCPServer(address, _Handler)
+    server.batcher = Batcher(**batcher_kwargs)
+    return server
+
+
+def serve(address, **batcher_kwargs):
+    """Runs a server on address until interrupted. See make_server."""
+    server = make_server(address, **batcher_kwargs)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve numutil's str2num"
+            " and num2str over a Unix socket or localhost TCP.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument('--unix', metavar='PATH', help="Unix socket path")
+    where.add_argument('--port', type=int, help="TCP port")
+    parser.add_argument('--host', default='127.0.0.1',
+            help="TCP host, (default 127.0.0.1)")
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-delay', type=float, default=0.001)
+    parser.add_argument('--max-pending', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    address = args.unix if args.unix else (args.host, args.port)
+    serve(address, max_batch=args.max_batch, max_delay=args.max_delay,
+            max_pending=args.max_pending)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import os
+import json
+import socket
+import tempfile
+import threading
 import unittest
 import doctest
-from numutil import str2num, num2str
-from numutil import _small_wordify, _sigfig_round
+from numutil import str2num, num2str, num2str_range, num2str_column
+from numutil import num2str_words
+from numutil import str2num_column
+from numutil import _small_wordify, _sigfig_round, _infer_column_format
+from numutil import _Rational
+from numutil_server import Batcher, make_server
 from fractions import Fraction
+from numbers import Rational
+from decimal import Decimal
 
 
 class test_str2num(unittest.TestCase):
@@ -183,6 +194,158 @@ class test_str2num(unittest.TestCase):
             self.assertEqual(guess, result)
             self.assertEqual(type(guess), type(result))
 
+    def test_fast_fractions(self):
+        for numstr, result in [('1/2', Fraction(1, 2)), ('6/ 6', 1),
+                (' 6,343 /10 ', Fraction(6343, 10)), ('-6/8', Fraction(-3, 4)),
+                ('three and a half', Fraction(7, 2)),
+                ('four halves', 2), ('5 sixths', Fraction(5, 6)),
+                ('12', 12), ('1.5', 1.5),
+                ('one and a half and 0.5', 2)]:
+            guess = str2num(numstr, fast_fractions=True)
+            self.assertEqual(guess, result)
+            if isinstance(guess, _Rational):
+                self.assertEqual(guess.to_fraction(), str2num(numstr))
+                self.assertEqual(type(str2num(numstr)), Fraction)
+                self.assertEqual((guess.numerator, guess.denominator),
+                        (result.numerator, result.denominator))
+            else:
+                self.assertEqual(type(guess), type(result))
+        self.assertRaises(ZeroDivisionError,
+                lambda: str2num('1/0', fast_fractions=True))
+
+    def test_fast_fractions_arithmetic(self):
+        h = str2num('one half', fast_fractions=True)
+        f = Fraction(1, 2)
+        for guess, result in [(-h, -f), (+h, f), (abs(-h), f), (h * 2, 1),
+                (2 * h, 1), (h - 1, -f), (1 - h, f), (h / 2, f / 2),
+                (2 / h, 4), (h + h, 1), (h * h, f * f), (h - h, 0),
+                (h / h, 1)]:
+            self.assertEqual(guess, result)
+            self.assertEqual(type(guess), _Rational)
+            self.assertEqual((guess.numerator, guess.denominator),
+                    (result.numerator, result.denominator))
+        for guess, result in [(h + f, 1), (f + h, 1), (h * f, Fraction(1, 4)),
+                (f / h, 1), (h - f, 0), (f - h, 0)]:
+            self.assertEqual(guess, result)
+            self.assertEqual(type(guess), Fraction)
+        for guess, result in [(h + 0.25, 0.75), (0.25 - h, -0.25),
+                (h * 1.5, 0.75), (1.0 / h, 2.0)]:
+            self.assertEqual(guess, result)
+            self.assertEqual(type(guess), float)
+        self.assertEqual(h.__truediv__(2), f / 2)
+        self.assertEqual(h.__rtruediv__(2), 4)
+        self.assertEqual(Fraction(h), f)
+        self.assertEqual(float(h), 0.5)
+        self.assertEqual(int(-str2num('7/2', fast_fractions=True)), -3)
+        self.assertRaises(ZeroDivisionError, lambda: h / 0)
+        self.assertRaises(ZeroDivisionError, lambda: h / (h - h))
+
+    def test_fast_fractions_rational_interface(self):
+        h = str2num('three halves', fast_fractions=True)
+        f = Fraction(3, 2)
+        self.assertTrue(isinstance(h, Rational))
+        for guess, result in [(h ** 2, f ** 2), (h ** -2, f ** -2),
+                (h ** str2num('2/1', fast_fractions=True), f ** 2),
+                (2 ** str2num('-2/1', fast_fractions=True), Fraction(1, 4)),
+                (h % 1, f % 1), (-h % 1, -f % 1), (7 % h, 7 % f),
+                (h.real, f), (h.conjugate(), f), (+h, f)]:
+            self.assertEqual(guess, result)
+            self.assertEqual(type(guess), _Rational)
+        for guess, result in [(h // 1, 1), (-h // 1, -2), (7 // h, 4),
+                (h.imag, 0), (divmod(h, 1)[0], 1)]:
+            self.assertEqual(guess, result)
+            self.assertEqual(type(guess), int)
+        self.assertEqual(divmod(h, 1), (1, Fraction(1, 2)))
+        self.assertEqual(divmod(7, h), (4, Fraction(1, 1)))
+        self.assertEqual(h ** 0.5, f ** 0.5)
+        self.assertEqual(4 ** h, 8.0)
+        self.assertEqual(h ** Fraction(1, 2), f ** Fraction(1, 2))
+        self.assertEqual(h // 0.5, 3.0)
+        self.assertEqual(h % Fraction(2, 3), f % Fraction(2, 3))
+        self.assertEqual(complex(h), 1.5 + 0j)
+        self.assertRaises(ZeroDivisionError, lambda: h // 0)
+        self.assertRaises(ZeroDivisionError,
+                lambda: str2num('0/1', fast_fractions=True) ** -1)
+
+    def test_fast_fractions_comparison(self):
+        h = str2num('one half', fast_fractions=True)
+        zero = str2num('0/5', fast_fractions=True)
+        self.assertFalse(zero)
+        self.assertTrue(h)
+        self.assertTrue(h < 1 and h <= 0.5 and h > 0 and h >= Fraction(1, 2))
+        self.assertTrue(h > Fraction(1, 3) and Fraction(1, 3) < h)
+        self.assertFalse(str2num('5/1', fast_fractions=True) < 1)
+        self.assertTrue(h == Fraction(1, 2) and Fraction(1, 2) == h)
+        self.assertTrue(h != 1 and h != Fraction(1, 3))
+        self.assertEqual(hash(h), hash(Fraction(1, 2)))
+        self.assertEqual(hash(str2num('4/2', fast_fractions=True)), hash(2))
+        nums = [str2num(numstr, fast_fractions=True) for numstr in
+                ['5/1', '1/3', '-1/2', 'three halves', '2/3']]
+        self.assertEqual(sorted(nums + [0, 1.25, Fraction(1, 4)]),
+                [Fraction(-1, 2), 0, Fraction(1, 4), Fraction(1, 3),
+                    Fraction(2, 3), 1.25, Fraction(3, 2), 5])
+
+    def test_zero_denominator_message(self):
+        for fast_fractions in [False, True]:
+            try:
+                str2num('1/0', fast_fractions=fast_fractions)
+            except ZeroDivisionError as e:
+                self.assertEqual(str(e), 'Fraction(1, 0)')
+            else:
+                self.fail("str2num('1/0') didn't raise")
+
+
+class test_str2num_column(unittest.TestCase):
+    """Tests the str2num_column function"""
+
+    def test_infer(self):
+        for sample, result in [(['1', '-23', '456'], 'int'),
+                (['1,234', '-12,345,678', '12'], 'commas_int'),
+                (['1.5', '-2.25', '1e5', '.5E-3'], 'float'),
+                (['1,234.5', '-12,345.75', '1.5'], 'commas_float'),
+                (['12.50', '1,234.56', '99.99', '45,000.00'], 'commas_float'),
+                (['12', '-1,234', '999', '1234', '45,000'], 'commas_int'),
+                (['0.5', '12.25', '1234.5'], 'float'),
+                (['1/2', ' -3 / 4 ', '1,000/3'], 'fraction'),
+                (['3.2 million', '12 Billion', '1,200 thousand'], 'suffixed'),
+                (['one', 'two', 'three halves'], None),
+                (['1', '2', 'three', 'four', 'five'], None), ([], None)]:
+            self.assertEqual(_infer_column_format(sample), result)
+
+    def test_matches_str2num(self):
+        others = ['twenty six', '5 sixths', 'four score and seven', '1e5',
+                '1,234', '1.5', '-7', '1/2', '2.5 million', 'NaN', '',
+                '7\n', '1,234\n', '1.5\n', '1/2\n', '5 million\n']
+        for column in [['1', '-23', '456', ' 7 ', '+8'],
+                ['1,234', '-12,345,678', '12', '1,2,3'],
+                ['1.5', '-2.25', '1e5', '.5E-3', '3.'],
+                ['1,234.5', '-12,345.75', '1.5', '7'],
+                ['1/2', ' -3 / 4 ', '1,000/3', '6/6', '0/5'],
+                ['3.2 million', '12 Billion', '1,200 thousand',
+                    '1.23456789 million', '-3.2 million', '.5 trillion']]:
+            column = column * 3 + others
+            expected = []
+            for numstr in column:
+                try: expected.append(str2num(numstr))
+                except ValueError: expected.append(ValueError)
+            for numstr, result in zip(column, expected):
+                if result is ValueError:
+                    self.assertRaises(ValueError,
+                            lambda: str2num_column(column[:18] + [numstr]))
+                    continue
+                guess = str2num_column(column[:18] + [numstr])[-1]
+                if result != result:  # NaN
+                    self.assertNotEqual(guess, guess)
+                else:
+                    self.assertEqual(guess, result)
+                self.assertEqual(type(guess), type(result))
+
+    def test_sample_size(self):
+        column = ['one', 'two'] + ['1,234'] * 5
+        self.assertEqual(str2num_column(column, sample_size=2),
+                [1, 2] + [1234] * 5)
+        self.assertEqual(str2num_column(iter(column)), [1, 2] + [1234] * 5)
+
 
 class test__sigfig_round(unittest.TestCase):
     """tests the _sigfig_round function"""
@@ -297,6 +460,305 @@ class test_num2str(unittest.TestCase):
         guess = num2str(Fraction(1, 2), style="words", frac_style="improper")
         self.assertEqual(guess, "one half")
 
+    def test_rationals(self):
+        for num in [Fraction(1, 2), Fraction(-5, 3), Fraction(7, 120),
+                Fraction(100, 1)]:
+            rational = _Rational(num.numerator, num.denominator)
+            for style in ['commas', 'words']:
+                for frac_style in ['mixed', 'improper']:
+                    self.assertEqual(num2str(rational, style, frac_style),
+                            num2str(num, style, frac_style))
+        self.assertEqual(num2str(Fraction(-100, 1), style='words'),
+                'negative one hundred')
+
+    def test_float_words(self):
+        for num, result in [(0.0, 'zero'), (1.0, 'one'),
+                (-1.5, 'negative one point five'),
+                (0.25, 'zero point two five'),
+                (1234.5, 'one thousand, two hundred thirty four point five'),
+                (2.675, 'two point six seven five'),
+                (1.5e-7, 'zero point zero zero zero zero zero zero one five'),
+                (1.5e16, 'fifteen quadrillion'),
+                (Decimal('3.50'), 'three point five zero'),
+                (Decimal('-0.07'), 'negative zero point zero seven'),
+                (Decimal('12E3'), 'twelve thousand')]:
+            guess = num2str(num, style="words")
+            self.assertEqual(guess, result)
+
+    def test_float_fraction_words(self):
+        for num, result in [(0.5, 'five tenths'), (0.01, 'one hundredth'),
+                (2.75, 'two and seventy five hundredths'),
+                (0.001, 'one thousandth'),
+                (0.0025, 'two thousand, five hundred millionths'),
+                (1.00005, 'one and fifty millionths'),
+                (1e-5, 'ten millionths'),
+                (1.5e-7, 'one hundred fifty billionths'),
+                (1e-6, 'one millionth'), (-3.0, 'negative three'),
+                (Decimal('3.00'), 'three'),
+                (Decimal('1.5E-33'), 'zero point' + ' zero' * 32 + ' one five')]:
+            guess = num2str(num, style="words", decimal_style='fraction')
+            self.assertEqual(guess, result)
+
+    def test_float_fraction_words_round_trip(self):
+        # str2num only reads the last group after 'and' as the fraction's
+        # numerator, so mixed numbers here have numerators below 1000
+        for num in [0.5, 0.01, 2.75, 0.001, 0.0025, 1.00005, 1e-5, 1.5e-7,
+                0.1234, 3.5e-10, 12.125, 7.0005, 0.000123456, 1e-30,
+                Decimal('0.0625'), Decimal('4.00007')]:
+            guess = str2num(num2str(num, style='words',
+                decimal_style='fraction'))
+            self.assertEqual(guess, Fraction(str(num)))
+
+    def test_float_words_sig_figs(self):
+        for num, result in [(1234.5678, 'one thousand, two hundred thirty'),
+                (0.012345, 'zero point zero one two three'),
+                (Decimal('2.71828'), 'two point seven two')]:
+            guess = num2str(num, style="words", sig_figs=3)
+            self.assertEqual(guess, result)
+
+    def test_float_words_errors(self):
+        for num in [float('inf'), float('-inf'), float('nan'),
+                Decimal('Infinity'), Decimal('-Infinity'), 10 ** 33, 1e40]:
+            self.assertRaises(ValueError, lambda: num2str(num, style='words'))
+        self.assertRaises(ValueError,
+                lambda: num2str(1.5, style='words', decimal_style='jim'))
+        self.assertRaises(TypeError, lambda: num2str('1', style='words'))
+
+    def test_num2str_words(self):
+        nums = [0, -12, 1234567, 0.5, -2.25, 1e-5, Decimal('7.10'),
+                Fraction(3, 2), Fraction(4, 1), 10 ** 30, 123.456]
+        for decimal_style in ['point', 'fraction']:
+            for sig_figs in [None, 2]:
+                guess = num2str_words(nums, decimal_style, sig_figs)
+                result = [num2str(num, 'words', sig_figs=sig_figs,
+                    decimal_style=decimal_style) for num in nums]
+                self.assertEqual(guess, result)
+        self.assertRaises(ValueError,
+                lambda: num2str_words([1], decimal_style='jim'))
+
+
+class test_num2str_range(unittest.TestCase):
+    """Tests the num2str_range function"""
+
+    def test_matches_num2str(self):
+        for style in ['words', 'commas', 'nocommas']:
+            for start, stop, step in [(0, 2500, 1), (-1500, 1500, 7),
+                    (999990, 1001010, 1), (10 ** 12 - 5, 10 ** 12 + 5, 1),
+                    (3000, -3000, -13), (0, 10 ** 10, 999999937)]:
+                guess = list(num2str_range(start, stop, step, style=style))
+                result = [num2str(i, style=style)
+                        for i in range(start, stop, step)]
+                self.assertEqual(guess, result)
+
+    def test_single_argument(self):
+        self.assertEqual(list(num2str_range(3)), ['zero', 'one', 'two'])
+
+    def test_empty(self):
+        self.assertEqual(list(num2str_range(5, 5)), [])
+        self.assertEqual(list(num2str_range(5, 0)), [])
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, lambda: num2str_range(0, 5, 0))
+        self.assertRaises(TypeError, lambda: num2str_range(0, 5.0))
+        self.assertRaises(ValueError,
+                lambda: num2str_range(0, 5, style='newspaper'))
+
+
+class test_num2str_column(unittest.TestCase):
+    """Tests the num2str_column function"""
+
+    def test_max(self):
+        guess = num2str_column([1234567, -25000000, 980000, 0])
+        self.assertEqual(guess, (['1.23', '-25.0', '0.980', '0.00'], 'million'))
+        guess = num2str_column([1.2E10, 3.4E9])
+        self.assertEqual(guess, (['12.0', '3.40'], 'billion'))
+
+    def test_median(self):
+        guess = num2str_column([1.5E6, 2.5E6, 3.5E9], scale='median')
+        self.assertEqual(guess, (['1.50', '2.50', '3,500'], 'million'))
+
+    def test_explicit_scale(self):
+        for scale in ['million', 10 ** 6]:
+            guess = num2str_column([123456789, 4567], scale=scale)
+            self.assertEqual(guess, (['123', '0.00457'], 'million'))
+        guess = num2str_column([123456789, 4567], scale='million',
+                sig_figs=None)
+        self.assertEqual(guess, (['123.456789', '0.004567'], 'million'))
+
+    def test_unscaled(self):
+        self.assertEqual(num2str_column([]), ([], None))
+        self.assertEqual(num2str_column([0, 0]), (['0', '0'], None))
+        self.assertEqual(num2str_column([123456, -1234]),
+                (['123,000', '-1,230'], None))
+
+    def test_small_values(self):
+        self.assertEqual(num2str_column([5e6, 12]),
+                (['5.00', '0.0000120'], 'million'))
+        self.assertEqual(num2str_column([2e6, -3]),
+                (['2.00', '-0.00000300'], 'million'))
+        self.assertEqual(num2str_column([2e6, 12], sig_figs=None),
+                (['2', '0.000012'], 'million'))
+
+    def test_decimals(self):
+        guess = num2str_column([Decimal('1234567.89'), Decimal('-980000'),
+            Decimal(0)])
+        self.assertEqual(guess, (['1.23', '-0.980', '0.00'], 'million'))
+        self.assertEqual(num2str_column([Decimal(1234)]), (['1,230'], None))
+
+    def test_matches_newspaper(self):
+        for num in [1234567, 9.99E8, 1.2E15, 45678901234, 999999999,
+                999500, 999499, 999999999999, 1000000]:
+            strings, word = num2str_column([num])
+            if word is not None:
+                strings[0] += ' ' + word
+            self.assertEqual(strings[0], num2str(num, style='newspaper'))
+
+    def test_nonfinite(self):
+        for bad in [float('inf'), float('-inf'), float('nan'),
+                Decimal('Infinity'), Decimal('NaN')]:
+            for scale in ['max', 'median', 'million']:
+                self.assertRaises(ValueError,
+                        lambda: num2str_column([1.5E6, bad], scale=scale))
+
+    def test_bad_scale(self):
+        for scale in ['hundred', 'a', 'jim', 100, 12345, 'mean']:
+            self.assertRaises(ValueError,
+                    lambda: num2str_column([1, 2], scale=scale))
+
+
+class test_numutil_server(unittest.TestCase):
+    """Tests the conversion server in numutil_server"""
+
+    def setUp(self):
+        self.server = make_server(('127.0.0.1', 0), max_delay=0.01)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.batcher.close()
+        self.thread.join()
+
+    def ask(self, lines, address=None):
+        sock = socket.socket(socket.AF_UNIX if address else socket.AF_INET)
+        sock.connect(address or self.server.server_address)
+        f = sock.makefile('r+')
+        responses = []
+        for line in lines:
+            f.write(line + '\n')
+            f.flush()
+            responses.append(f.readline().rstrip('\n'))
+        sock.close()
+        return responses
+
+    def test_plain_lines(self):
+        self.assertEqual(self.ask(['1.3 million', 'three and a half',
+                '123,456.789', 'jim']), ['1300000', '7/2', '123456.789',
+                "error: Could not parse 'jim' into a number, because did not"
+                " recognize the word 'jim'"])
+
+    def test_json_lines(self):
+        responses = self.ask([
+                '{"op": "str2num", "value": "three halves", "id": 7}',
+                '{"op": "num2str", "value": 1234567, "kwargs": {"style": "words"}}',
+                '{"op": "num2str", "value": 0.5, "kwargs": {"style": "words",'
+                    ' "decimal_style": "fraction"}}',
+                '{"op": "num2str", "value": 1, "kwargs": {"foshizzle": 1}}',
+                '{"op": "frobnicate", "value": 1}', '{"op": ', '{}'])
+        responses = [json.loads(response) for response in responses]
+        self.assertEqual(responses[0], {'id': 7, 'result': '3/2'})
+        self.assertEqual(responses[1], {'result': num2str(1234567,
+                style='words')})
+        self.assertEqual(responses[2], {'result': 'five tenths'})
+        for response in responses[3:]:
+            self.assertEqual(list(response), ['error'])
+
+    def test_nonfinite_json(self):
+        responses = self.ask(['{"value": "%s"}' % numstr
+                for numstr in ['NaN', 'inf', '-inf', '1e400']])
+        for response, result in zip(responses,
+                ['NaN', 'Infinity', '-Infinity', 'Infinity']):
+            # Strict JSON parsers reject bare NaN and Infinity
+            self.assertEqual(json.loads(response,
+                parse_constant=self.fail), {'result': result})
+        self.assertEqual(self.ask(['nan', '-inf']), ['NaN', '-Infinity'])
+
+    def test_concurrent_clients(self):
+        results = {}
+        def client(i):
+            results[i] = self.ask([str(i), '%d,000' % i])
+        threads = [threading.Thread(target=client, args=(i,))
+                for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results,
+                dict((i, [str(i), str(i * 1000)]) for i in range(20)))
+
+        stats = json.loads(self.ask(['{"op": "stats"}'])[0])['result']
+        self.assertEqual(stats['requests'], 40)
+        self.assertEqual(stats['errors'], 0)
+        self.assertTrue(0 < stats['batches'] <= 40)
+        self.assertTrue(stats['max_latency'] >= stats['mean_latency'] > 0)
+
+    def test_unix_socket(self):
+        address = os.path.join(tempfile.mkdtemp(), 'numutil.sock')
+        server = make_server(address)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            self.assertEqual(self.ask(['twenty six'], address), ['26'])
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.batcher.close()
+            thread.join()
+        self.assertFalse(os.path.exists(address))
+
+    def test_batcher_errors(self):
+        batcher = Batcher(max_batch=2)
+        try:
+            self.assertRaises(ValueError,
+                    lambda: batcher.submit('str2num', 'jim'))
+            self.assertRaises(ValueError,
+                    lambda: batcher.submit('num2str', 1, {'style': 'jim'}))
+            self.assertRaises(TypeError,
+                    lambda: batcher.submit('str2num', '1', {'style': 'jim'}))
+            self.assertRaises(TypeError, lambda: batcher.submit('str2num', 1))
+            self.assertEqual(batcher.submit('num2str', 1.25, {'style': 'words',
+                'decimal_style': 'fraction'}), 'one and twenty five hundredths')
+            self.assertRaises(ValueError, lambda: batcher.submit('jim', 1))
+            self.assertEqual(batcher.stats()['errors'], 2)
+        finally:
+            batcher.close()
+        self.assertRaises(ValueError, lambda: Batcher(max_batch=0))
+
+    def test_submit_while_closing(self):
+        batcher = Batcher(max_batch=4, max_pending=2)
+        outcomes = []
+        def client(i):
+            for j in range(50):
+                try:
+                    outcomes.append(batcher.submit('str2num', str(i * j))
+                            == i * j)
+                except ValueError:
+                    outcomes.append('closed')
+        threads = [threading.Thread(target=client, args=(i,))
+                for i in range(8)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        batcher.close()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(len(outcomes), 400)
+        self.assertTrue(False not in outcomes)
+        self.assertRaises(ValueError, lambda: batcher.submit('str2num', '1'))
+        batcher.close()  # Closing twice is harmless
+
 
 class test_documentation(unittest.TestCase):
     """Doctests the documentation in the files"""
@@ -309,6 +771,10 @@ class test_documentation(unittest.TestCase):
         failures, tests = doctest.testfile('numutil.py', package='numutil')
         self.assertEqual(failures, 0)
 
+    def test_numutil_server(self):
+        failures, tests = doctest.testfile('numutil_server.py')
+        self.assertEqual(failures, 0)
+
 
 if __name__ == "__main__":
     unittest.main()